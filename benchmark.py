@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the OpenAI helpers.
+
+Runs against fake in-process servers, so no API key or network is needed:
+    python benchmark.py
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import prompts
+from resilience import LatencyTracker, hedged_call, percentile
+
+
+class FakeServer:
+    """Answers after a base latency, with occasional injected spikes."""
+
+    def __init__(self, base=0.02, jitter=0.01, spike=0.5, spike_rate=0.02, seed=7):
+        self.base = base
+        self.jitter = jitter
+        self.spike = spike
+        self.spike_rate = spike_rate
+        self._rng = random.Random(seed)
+
+    def complete(self):
+        delay = self.base + self._rng.random() * self.jitter
+        if self._rng.random() < self.spike_rate:
+            delay += self.spike
+        time.sleep(delay)
+        return "ok"
+
+
+def bench_hedging(calls: int = 300):
+    """Report p50/p99 latency of a spiky fake server with and without hedging."""
+    executor = ThreadPoolExecutor(max_workers=8)
+    results = {}
+
+    for label, hedge in (("no hedging", False), ("hedging", True)):
+        server = FakeServer()
+        tracker = LatencyTracker()
+
+        def attempt():
+            started = time.monotonic()
+            text = server.complete()
+            tracker.record(time.monotonic() - started)
+            return text
+
+        latencies = []
+        extra_requests = 0
+        for _ in range(calls):
+            delay = tracker.percentile(95) if hedge and len(tracker) >= 20 else None
+            started = time.monotonic()
+            _, attempts = hedged_call(attempt, executor, deadline=5.0, hedge_delay=delay)
+            extra_requests += attempts - 1
+            latencies.append(time.monotonic() - started)
+        results[label] = latencies, extra_requests
+
+    executor.shutdown(wait=True)
+
+    print(f"\n⏱️  Hedged requests ({calls} calls, 2% spikes of +500ms)")
+    for label, (latencies, extra_requests) in results.items():
+        p50 = percentile(latencies, 50) * 1000
+        p99 = percentile(latencies, 99) * 1000
+        print(f"  {label:<12} p50={p50:7.1f}ms  p99={p99:7.1f}ms  extra requests={extra_requests}")
+    return results
+
+
+class FakeCachingServer:
+    """
+    Mimics provider prompt caching: prompts of at least `min_tokens` reuse the
+    longest previously seen prefix, in `block_tokens` increments, and only
+    uncached tokens add latency. Tokens are approximated as 4 characters.
+    """
+
+    def __init__(self, per_token=0.00005, base=0.05, min_tokens=1024, block_tokens=128):
+        self.per_token = per_token
+        self.base = base
+        self.min_chars = min_tokens * 4
+        self.block_chars = block_tokens * 4
+        self._prefixes = set()
+
+    def complete(self, messages):
+        text = "".join(f"{m['role']}:{m['content']}\n" for m in messages)
+        blocks = len(text) // self.block_chars
+        cached_chars = 0
+        if len(text) >= self.min_chars:
+            for k in range(blocks, 0, -1):
+                if hash(text[: k * self.block_chars]) in self._prefixes:
+                    cached_chars = k * self.block_chars
+                    break
+        self._prefixes.update(hash(text[: k * self.block_chars]) for k in range(1, blocks + 1))
+
+        prompt_tokens = len(text) // 4
+        cached = cached_chars // 4
+        time.sleep(self.base + (prompt_tokens - cached) * self.per_token)
+        return SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=0,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+        )
+
+
+def _legacy_resume_messages(template, job_description):
+    """The pre-prompts.py layout: job description first, template after it."""
+    prompt = f"""
+        Given this job description:
+        {job_description}
+
+        Tailor the following resume template:
+        {template}
+
+        Focus on matching key skills, experiences, and achievements.
+        """
+    return [{"role": "user", "content": prompt}]
+
+
+def bench_prompt_cache(resumes: int = 20):
+    """Report cache rate and latency savings for a batch of resume customizations."""
+    rng = random.Random(11)
+    bullets = "\n".join(
+        f"• Project {i}: built and secured a Flask + MySQL service handling {rng.randint(100, 999)} daily users"
+        for i in range(60)
+    )
+    template = f"PRIYANSHI DWIVEDI\nFull-Stack Web Developer\n\nPROJECTS\n{bullets}"
+    jobs = [
+        f"Job {i}: {rng.choice(['Python', 'Security', 'IT Support'])} engineer, "
+        f"{rng.randint(1, 5)} years, skills: {', '.join(rng.sample(['Flask', 'Linux', 'SOC', 'Git', 'SQL', 'AWS'], 3))}"
+        for i in range(resumes)
+    ]
+
+    print(f"\n🗄️  Prompt caching ({resumes} resume customizations)")
+    for label, build in (("legacy layout", _legacy_resume_messages), ("stable prefix", prompts.customize_resume_messages)):
+        server = FakeCachingServer()
+        stats = prompts.PromptCacheStats()
+        total = time.monotonic()
+        for job in jobs:
+            started = time.monotonic()
+            usage = server.complete(build(template, job))
+            stats.record(usage, time.monotonic() - started)
+        total = time.monotonic() - total
+        print(f"  {label:<14} {stats.report()} | batch {total:.2f}s")
+
+
+def main():
+    bench_hedging()
+    bench_prompt_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
 
 import os
+import json
 import time
+import atexit
 import random
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from bs4 import BeautifulSoup
-from openai import OpenAI
+from openai import DEFAULT_MAX_RETRIES, OpenAI, RateLimitError
 from dotenv import load_dotenv
 
+import prompts
+from resilience import CircuitBreaker, LatencyTracker, ResponseCache, hedged_call
+from routing import ModelRouter
+
 # Load environment variables
 load_dotenv()
 
@@ -19,35 +27,155 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
 
 # ---------- Helper ----------
-def ask_openai(prompt: str, model="gpt-4o-mini"):
-    """Send a prompt to OpenAI and return response text."""
+# Per-call deadline (seconds) and hedging; override via .env
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+OPENAI_HEDGE = os.getenv("OPENAI_HEDGE", "true").lower() == "true"
+# Until enough latencies are recorded to estimate p95, the hedge delay is
+# scaled to the expected output length (conservative tokens/second)
+HEDGE_BASE_DELAY = 1.0
+HEDGE_TOKENS_PER_SECOND = 50
+MIN_HEDGE_SAMPLES = 5
+# Latency samples are kept between runs so the p95 delay survives short sessions
+LATENCY_STATS_PATH = ".openai_latency.json"
+# A losing hedge still runs to completion and is billed, so long generations
+# are only hedged when the caller passes hedge=True
+HEDGE_MAX_TOKENS = 600
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="openai")
+_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+_cache = ResponseCache(max_entries=128)
+
+
+def _load_latency(path: str = LATENCY_STATS_PATH) -> dict:
+    """Load latency samples saved by earlier runs, keyed by (model, max_tokens)."""
     try:
-        response = client.chat.completions.create(
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    trackers = {}
+    for key, samples in data.items():
+        model, _, budget = key.rpartition("|")
+        tracker = LatencyTracker()
+        for seconds in samples:
+            tracker.record(seconds)
+        trackers[(model, None if budget == "None" else int(budget))] = tracker
+    return trackers
+
+
+def _save_latency(path: str = LATENCY_STATS_PATH):
+    data = {f"{model}|{budget}": list(tracker.samples) for (model, budget), tracker in _latency.items()}
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    except OSError as e:
+        print(f"⚠️ Could not save latency stats: {e}")
+
+
+_latency = _load_latency()
+atexit.register(_save_latency)
+
+
+def _hedge_delay(model: str, max_tokens: int = None):
+    tracker = _latency.get((model, max_tokens))
+    if tracker is None or len(tracker) < MIN_HEDGE_SAMPLES:
+        return HEDGE_BASE_DELAY + (max_tokens or HEDGE_MAX_TOKENS) / HEDGE_TOKENS_PER_SECOND
+    return tracker.percentile(95)
+
+
+def complete_openai(prompt, model="gpt-4o-mini", max_tokens: int = None, timeout: float = None, hedge: bool = None):
+    """
+    Send a prompt to OpenAI and return (response text, usage, attempts).
+
+    `prompt` is either a plain string (sent as one user message) or a list
+    of chat messages, see prompts.build_messages.
+
+    The call is bounded by `timeout` seconds and, when hedging is on, a
+    duplicate request is fired once the first one runs past the p95 latency
+    recorded for this model and token budget. By default only calls with a
+    max_tokens budget of at most HEDGE_MAX_TOKENS are hedged.
+
+    While the circuit breaker is open, the last cached answer for the same
+    prompt (or "") is returned without hitting the API; usage is None
+    whenever no API response was used. `attempts` is the number of billed
+    requests, including a losing hedge.
+    """
+    timeout = OPENAI_TIMEOUT if timeout is None else timeout
+    if hedge is None:
+        hedge = OPENAI_HEDGE and max_tokens is not None and max_tokens <= HEDGE_MAX_TOKENS
+    if isinstance(prompt, str):
+        messages = [{"role": "user", "content": prompt}]
+    else:
+        messages = prompt
+    cache_key = (model, tuple((m["role"], m["content"]) for m in messages))
+
+    if not _breaker.allow_request():
+        print("⚠️ OpenAI temporarily unavailable, serving cached/degraded response.")
+        return _cache.get(cache_key) or "", None, 0
+
+    options = {"max_tokens": max_tokens} if max_tokens else {}
+
+    def attempt():
+        started = time.monotonic()
+        # Hedged calls retry through the hedge; unhedged ones keep the SDK's backoff retries
+        response = client.with_options(max_retries=0 if hedge else DEFAULT_MAX_RETRIES).chat.completions.create(
             model=model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
+            timeout=timeout,
+            **options,
+        )
+        _latency.setdefault((model, max_tokens), LatencyTracker()).record(time.monotonic() - started)
+        return response.choices[0].message.content.strip(), response.usage
+
+    try:
+        (text, usage), attempts = hedged_call(
+            attempt,
+            _executor,
+            timeout,
+            _hedge_delay(model, max_tokens) if hedge else None,
+            # Retrying a 429 straight away only adds load; wait for the hedge delay instead
+            retry_now=lambda exc: not isinstance(exc, RateLimitError),
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
+        _breaker.record_failure()
         print(f"⚠️ Error generating response: {e}")
-        return ""
+        return _cache.get(cache_key) or "", None, 0
+
+    _breaker.record_success()
+    _cache.put(cache_key, text)
+    return text, usage, attempts
+
+
+def ask_openai(prompt: str, model="gpt-4o-mini", **kwargs):
+    """Send a prompt to OpenAI and return response text."""
+    return complete_openai(prompt, model=model, **kwargs)[0]
+
+
+# Routes each task to its model tier and token budget, see routing.ROUTES
+router = ModelRouter(complete_openai)
 
 
 # ---------- Resume Manager ----------
+RESUME_TEMPLATE_PATH = "resumes/fullstack_resume.txt"
+
+
 class ResumeManager:
     def __init__(self, template: str = ""):
         self.template = template or "Generic Resume Template"
 
-    def customize_resume(self, job_description: str) -> str:
-        prompt = f"""
-        Given this job description:
-        {job_description}
-
-        Tailor the following resume template:
-        {self.template}
+    @classmethod
+    def from_file(cls, path: str = RESUME_TEMPLATE_PATH):
+        """Load the resume template created by setup.py, if it exists."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(f.read())
+        except OSError:
+            print(f"⚠️ Resume template {path} not found, using a generic template.")
+            return cls()
 
-        Focus on matching key skills, experiences, and achievements.
-        """
-        return ask_openai(prompt)
+    def customize_resume(self, job_description: str) -> str:
+        messages = prompts.customize_resume_messages(self.template, job_description)
+        return router.ask("customize_resume", messages)
 
 
 # ---------- Job Scraper ----------
@@ -73,56 +201,23 @@ class JobScraper:
         return jobs
 
     def extract_requirements(self, description: str) -> list:
-        prompt = f"""
-        Extract the key technical requirements and skills from this job description:
-
-        {description[:1000]}
-
-        Return only a comma-separated list of skills and requirements.
-        """
-        requirements_text = ask_openai(prompt)
+        messages = prompts.extract_requirements_messages(description)
+        requirements_text = router.ask("extract_requirements", messages)
         return [r.strip() for r in requirements_text.split(",") if r.strip()]
 
 
 # ---------- Interview Prep ----------
 class InterviewCrackerAI:
     def generate_interview_questions(self, job_title: str, company: str, experience_level: str = "mid") -> list:
-        prompt = f"""
-        Generate 10 interview questions for a {job_title} position at {company}.
-        Experience level: {experience_level}
-
-        Include:
-        - Technical questions
-        - Behavioral questions
-        - Company-specific questions
-        - Situational questions
-
-        Return only the questions, one per line.
-        """
-        questions_text = ask_openai(prompt)
+        messages = prompts.interview_questions_messages(job_title, company, experience_level)
+        questions_text = router.ask("interview_questions", messages)
         return [q.strip() for q in questions_text.split("\n") if q.strip()]
 
     def generate_aptitude_test(self, num_questions: int = 5) -> list:
-        prompt = f"""
-        Generate {num_questions} multiple-choice aptitude test questions.
-        Each should have 4 options (A-D) and specify the correct answer.
-
-        Format:
-        Q: <question>
-        A. ...
-        B. ...
-        C. ...
-        D. ...
-        Answer: <correct option>
-        """
-        return ask_openai(prompt)
+        return router.ask("aptitude_test", prompts.aptitude_test_messages(num_questions))
 
     def provide_interview_tips(self, job_title: str) -> str:
-        prompt = f"""
-        Give me 5 specific interview preparation tips for a {job_title} role.
-        Format as a numbered list.
-        """
-        return ask_openai(prompt)
+        return router.ask("interview_tips", prompts.interview_tips_messages(job_title))
 
 
 # ---------- History ----------
@@ -148,7 +243,7 @@ def main():
     print("=" * 50)
 
     scraper = JobScraper()
-    resume_manager = ResumeManager("My Resume Template")
+    resume_manager = ResumeManager.from_file()
     interview_ai = InterviewCrackerAI()
     history = ApplicationHistory()
 
@@ -159,9 +254,10 @@ def main():
         print("3. Prepare for interview")
         print("4. Take aptitude test")
         print("5. View application history")
-        print("6. Exit")
+        print("6. View model usage stats")
+        print("7. Exit")
 
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = input("\nEnter your choice (1-7): ").strip()
 
         if choice == "1":
             jobs = scraper.scrape_jobs("python developer")
@@ -199,6 +295,9 @@ def main():
             history.show_history()
 
         elif choice == "6":
+            print(router.metrics.report())
+
+        elif choice == "7":
             print("👋 Exiting...")
             break
         else:
@@ -0,0 +1,128 @@
+"""
+Prompt builders laid out for provider-side prompt caching.
+
+OpenAI caches the longest previously seen prompt prefix, so every builder
+puts the stable part first (instructions, then any template) in a system
+message and the per-call data last in the user message. Keep the constants
+below free of per-call values: changing a single byte of a prefix turns
+every following call into a cache miss.
+"""
+
+import threading
+
+
+# ---------- Stable Instructions ----------
+RESUME_INSTRUCTIONS = """You tailor resumes to job descriptions.
+Rewrite the resume template below so it matches the job the user sends.
+Focus on matching key skills, experiences, and achievements.
+Keep the original structure and never invent experience that is not in the template."""
+
+REQUIREMENTS_INSTRUCTIONS = """Extract the key technical requirements and skills from the job description the user sends.
+Return only a comma-separated list of skills and requirements."""
+
+INTERVIEW_QUESTIONS_INSTRUCTIONS = """Generate 10 interview questions for the position the user describes.
+
+Include:
+- Technical questions
+- Behavioral questions
+- Company-specific questions
+- Situational questions
+
+Return only the questions, one per line."""
+
+APTITUDE_INSTRUCTIONS = """Generate multiple-choice aptitude test questions.
+Each should have 4 options (A-D) and specify the correct answer.
+
+Format:
+Q: <question>
+A. ...
+B. ...
+C. ...
+D. ...
+Answer: <correct option>"""
+
+INTERVIEW_TIPS_INSTRUCTIONS = """Give specific interview preparation tips for the role the user names.
+Format as a numbered list."""
+
+
+# ---------- Builders ----------
+def build_messages(instructions: str, variable: str, template: str = "") -> list:
+    """Return chat messages with a stable system prefix and a variable user tail."""
+    system = instructions if not template else f"{instructions}\n\n{template}"
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": variable},
+    ]
+
+
+def customize_resume_messages(template: str, job_description: str) -> list:
+    return build_messages(
+        RESUME_INSTRUCTIONS,
+        f"Job description:\n{job_description}",
+        template=f"Resume template:\n{template}",
+    )
+
+
+def extract_requirements_messages(description: str) -> list:
+    return build_messages(REQUIREMENTS_INSTRUCTIONS, f"Job description:\n{description[:1000]}")
+
+
+def interview_questions_messages(job_title: str, company: str, experience_level: str = "mid") -> list:
+    return build_messages(
+        INTERVIEW_QUESTIONS_INSTRUCTIONS,
+        f"Position: {job_title} at {company}\nExperience level: {experience_level}",
+    )
+
+
+def aptitude_test_messages(num_questions: int = 5) -> list:
+    return build_messages(APTITUDE_INSTRUCTIONS, f"Number of questions: {num_questions}")
+
+
+def interview_tips_messages(job_title: str) -> list:
+    return build_messages(INTERVIEW_TIPS_INSTRUCTIONS, f"Role: {job_title}\nNumber of tips: 5")
+
+
+# ---------- Cache Accounting ----------
+def cached_tokens(usage) -> int:
+    """Cached prompt tokens reported in `response.usage` (0 if absent)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+class PromptCacheStats:
+    """Effective prompt-cache rate and latency of cache hits vs misses."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.hits = []
+        self.misses = []
+        self._lock = threading.Lock()
+
+    def record(self, usage, latency: float):
+        if usage is None:
+            return
+        cached = cached_tokens(usage)
+        with self._lock:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.cached_tokens += cached
+            (self.hits if cached else self.misses).append(latency)
+
+    @property
+    def cache_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def latency_savings(self) -> float:
+        """Estimated seconds saved: (mean miss - mean hit) latency x number of hits."""
+        if not self.hits or not self.misses:
+            return 0.0
+        mean_hit = sum(self.hits) / len(self.hits)
+        mean_miss = sum(self.misses) / len(self.misses)
+        return max(0.0, mean_miss - mean_hit) * len(self.hits)
+
+    def report(self) -> str:
+        calls = len(self.hits) + len(self.misses)
+        return (
+            f"cache {self.cache_rate:.0%} of {self.prompt_tokens} prompt tokens "
+            f"({len(self.hits)}/{calls} calls hit, ~{self.latency_savings():.1f}s saved)"
+        )
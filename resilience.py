@@ -0,0 +1,174 @@
+"""
+Resilience helpers for OpenAI calls: latency tracking, hedged requests,
+a circuit breaker and a small response cache.
+
+Kept free of third-party imports so it can be exercised without an API key.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# ---------- Latency Tracking ----------
+class LatencyTracker:
+    """Rolling window of call latencies (seconds) with percentile lookup."""
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct: float):
+        """Return the pct-th percentile, or None if nothing was recorded yet."""
+        with self._lock:
+            data = sorted(self.samples)
+        return percentile(data, pct)
+
+    def __len__(self):
+        return len(self.samples)
+
+
+def percentile(data, pct: float):
+    """Nearest-rank percentile of an iterable of numbers (None if empty)."""
+    data = sorted(data)
+    if not data:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(data)))
+    return data[min(rank, len(data)) - 1]
+
+
+# ---------- Circuit Breaker ----------
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast for `reset_timeout` seconds. The next call after that
+    is let through as a trial: success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        return self.state != self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+# ---------- Response Cache ----------
+class ResponseCache:
+    """Bounded LRU cache of successful responses, used as a degraded fallback."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+# ---------- Hedged Calls ----------
+def hedged_call(fn, executor: ThreadPoolExecutor, deadline: float, hedge_delay=None, retry_now=None):
+    """
+    Run `fn()` on `executor` and return (first successful result, attempts).
+
+    If the first attempt has not finished after `hedge_delay` seconds, a
+    duplicate attempt is fired and whichever succeeds first wins. If the first
+    attempt fails before then, the duplicate fires immediately, unless
+    `retry_now(exc)` returns False (e.g. rate limiting), in which case it
+    waits for the hedge delay. `attempts` counts every attempt that was not
+    cancelled or failed, including a losing hedge that keeps running (and is
+    billed) after the winner returns. Raises TimeoutError once `deadline`
+    seconds have passed, or the last attempt's exception if every attempt
+    failed.
+    """
+    start = time.monotonic()
+    pending = {executor.submit(fn)}
+    submitted = 1
+    failed = 0
+    hedges_left = 1 if hedge_delay is not None else 0
+    last_error = None
+
+    while pending or hedges_left:
+        elapsed = time.monotonic() - start
+        remaining = deadline - elapsed
+        if remaining <= 0:
+            break
+        timeout = remaining
+        if hedges_left:
+            timeout = min(timeout, max(0.0, hedge_delay - elapsed))
+        if pending:
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        else:
+            # The first attempt failed with a non-retryable error: back off until the hedge delay
+            time.sleep(timeout)
+            done = set()
+
+        for future in done:
+            if future.exception() is None:
+                cancelled = sum(other.cancel() for other in pending)
+                return future.result(), submitted - cancelled - failed
+            failed += 1
+            last_error = future.exception()
+
+        delay_elapsed = time.monotonic() - start >= hedge_delay if hedges_left else False
+        retry_early = not pending and (retry_now is None or retry_now(last_error))
+        if hedges_left and (delay_elapsed or retry_early):
+            pending.add(executor.submit(fn))
+            submitted += 1
+            hedges_left -= 1
+
+    for other in pending:
+        other.cancel()
+    if pending or last_error is None:
+        raise TimeoutError(f"No response within {deadline:.1f}s")
+    raise last_error
@@ -0,0 +1,237 @@
+"""
+Task-aware model routing for OpenAI calls.
+
+Each task maps to a model tier and a max-token budget. Routes may name a
+stronger model to escalate to when the cheap model's output fails the
+task's validator. Latency, token and cost histograms are kept per task so
+the routing table can be tuned from real usage.
+"""
+
+import bisect
+import threading
+import time
+
+from prompts import PromptCacheStats, cached_tokens
+
+
+# ---------- Routing Table ----------
+class Route:
+    """Model tier, token budget and optional escalation target for a task."""
+
+    def __init__(self, model: str, max_tokens: int, escalate_to: str = None):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.escalate_to = escalate_to
+
+    def __repr__(self):
+        return f"Route({self.model!r}, {self.max_tokens}, escalate_to={self.escalate_to!r})"
+
+
+ROUTES = {
+    "extract_requirements": Route("gpt-4o-mini", 200, escalate_to="gpt-4o"),
+    "customize_resume": Route("gpt-4o", 1500),
+    "interview_questions": Route("gpt-4o-mini", 600, escalate_to="gpt-4o"),
+    "interview_tips": Route("gpt-4o-mini", 400),
+    "aptitude_test": Route("gpt-4o-mini", 900, escalate_to="gpt-4o"),
+}
+
+# USD per 1M tokens: (input, output); cached input tokens bill at CACHED_INPUT_DISCOUNT
+CACHED_INPUT_DISCOUNT = 0.5
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+# ---------- Output Validation ----------
+def _valid_requirements(text: str) -> bool:
+    items = [r.strip() for r in text.split(",") if r.strip()]
+    return len(items) >= 2 and all(len(r) <= 80 for r in items)
+
+
+def _valid_resume(text: str) -> bool:
+    return len(text) >= 200
+
+
+def _valid_questions(text: str) -> bool:
+    return len([q for q in text.split("\n") if q.strip()]) >= 5
+
+
+def _valid_tips(text: str) -> bool:
+    return len([t for t in text.split("\n") if t.strip()[:1].isdigit()]) >= 3
+
+
+def _valid_aptitude(text: str) -> bool:
+    return "Answer" in text
+
+
+VALIDATORS = {
+    "extract_requirements": _valid_requirements,
+    "customize_resume": _valid_resume,
+    "interview_questions": _valid_questions,
+    "interview_tips": _valid_tips,
+    "aptitude_test": _valid_aptitude,
+}
+
+
+# ---------- Metrics ----------
+class Histogram:
+    """Fixed-bucket histogram; the last bucket catches everything above the bounds."""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float):
+        """Upper bound of the bucket holding the q-quantile (None if empty)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds + [float("inf")], self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+LATENCY_BOUNDS = [0.25, 0.5, 1, 2, 4, 8, 16, 32]
+TOKEN_BOUNDS = [64, 128, 256, 512, 1024, 2048, 4096]
+COST_BOUNDS = [0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached: int = 0) -> float:
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    input_cost = (prompt_tokens - cached) * input_price + cached * input_price * CACHED_INPUT_DISCOUNT
+    return (input_cost + completion_tokens * output_price) / 1_000_000
+
+
+class TaskMetrics:
+    """Per-task latency, token and cost histograms, per-model prompt-cache stats and escalation counts."""
+
+    def __init__(self):
+        self.tasks = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, task: str) -> dict:
+        if task not in self.tasks:
+            self.tasks[task] = {
+                "latency": Histogram(LATENCY_BOUNDS),
+                "tokens": Histogram(TOKEN_BOUNDS),
+                "cost": Histogram(COST_BOUNDS),
+                "cache": {},
+                "models": {},
+                "escalations": 0,
+                "invalid": 0,
+                "degraded": 0,
+                "hedges": 0,
+            }
+        return self.tasks[task]
+
+    def record(self, task: str, model: str, latency: float, usage=None, attempts: int = 1):
+        """
+        Record one call; calls without usage (error or open circuit) only count
+        as degraded. Cost is multiplied by `attempts`, since a losing hedge is
+        billed like the winner.
+        """
+        if usage is None:
+            with self._lock:
+                self._stats(task)["degraded"] += 1
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        with self._lock:
+            stats = self._stats(task)
+            stats["latency"].observe(latency)
+            stats["tokens"].observe(prompt_tokens + completion_tokens)
+            cost = estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens(usage))
+            stats["cost"].observe(cost * max(attempts, 1))
+            stats["hedges"] += max(attempts - 1, 0)
+            stats["models"][model] = stats["models"].get(model, 0) + 1
+            cache = stats["cache"].setdefault(model, PromptCacheStats())
+        cache.record(usage, latency)
+
+    def record_escalation(self, task: str):
+        with self._lock:
+            self._stats(task)["escalations"] += 1
+
+    def record_invalid(self, task: str):
+        with self._lock:
+            self._stats(task)["invalid"] += 1
+
+    def report(self) -> str:
+        if not self.tasks:
+            return "📊 No model calls recorded yet."
+        lines = ["📊 Model usage by task:"]
+        with self._lock:
+            for task, stats in sorted(self.tasks.items()):
+                latency, tokens, cost = stats["latency"], stats["tokens"], stats["cost"]
+                models = ", ".join(f"{m}×{n}" for m, n in stats["models"].items())
+                # Cache hit/miss latencies are only comparable within one model
+                cache_text = "; ".join(f"{m} {c.report()}" for m, c in stats["cache"].items()) or "cache n/a"
+                latency_text = (
+                    f"latency p50≤{latency.quantile(0.5)}s p95≤{latency.quantile(0.95)}s"
+                    if latency.count else "latency n/a"
+                )
+                lines.append(
+                    f"- {task}: {latency.count} calls ({models}) | "
+                    f"{latency_text} | "
+                    f"avg tokens {tokens.mean:.0f} | {cache_text} | cost ${cost.total:.4f} | "
+                    f"escalations {stats['escalations']} | invalid {stats['invalid']} | "
+                    f"hedges {stats['hedges']} | failed/degraded {stats['degraded']}"
+                )
+        return "\n".join(lines)
+
+
+# ---------- Router ----------
+class ModelRouter:
+    """
+    Dispatch prompts to the model configured for each task.
+
+    `complete` is called as complete(prompt, model=..., max_tokens=...), where
+    prompt is a string or a list of chat messages, and must return
+    (text, usage, attempts) with usage None when no API response was used
+    (error or open circuit) and attempts the number of billed requests.
+    Only real responses failing the task's validator are retried once on
+    the route's `escalate_to` model, if one is set.
+    """
+
+    def __init__(self, complete, routes: dict = None, validators: dict = None, metrics: TaskMetrics = None):
+        self.complete = complete
+        self.routes = ROUTES if routes is None else routes
+        self.validators = VALIDATORS if validators is None else validators
+        self.metrics = metrics or TaskMetrics()
+
+    def _call(self, task: str, prompt, model: str, max_tokens: int):
+        started = time.monotonic()
+        text, usage, attempts = self.complete(prompt, model=model, max_tokens=max_tokens)
+        self.metrics.record(task, model, time.monotonic() - started, usage, attempts)
+        return text, usage
+
+    def ask(self, task: str, prompt) -> str:
+        route = self.routes[task]
+        validate = self.validators.get(task, bool)
+
+        text, usage = self._call(task, prompt, route.model, route.max_tokens)
+        # A failed or degraded call says nothing about the model's output quality
+        if usage is None or validate(text):
+            return text
+
+        self.metrics.record_invalid(task)
+        if route.escalate_to and route.escalate_to != route.model:
+            self.metrics.record_escalation(task)
+            escalated, usage = self._call(task, prompt, route.escalate_to, route.max_tokens)
+            if usage is not None and (validate(escalated) or not text):
+                return escalated
+        return text
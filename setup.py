@@ -2,14 +2,37 @@
 """
 Job Automation Bot - Setup Script
 Automated setup for Priyanshi's Job Application System
+
+Safe to re-run: generated files are only written when their content changed,
+files edited by hand are left alone, and pip only runs for requirements that
+are not already installed. Progress is recorded in .setup_state.json.
 """
 
 import os
+import re
 import json
+import hashlib
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+except ImportError:  # packaging ships with pip/setuptools but isn't guaranteed
+    Requirement = None
+
+STATE_FILE = '.setup_state.json'
+_print_lock = threading.Lock()
+
+def log(*args):
+    """print() that doesn't interleave lines from the parallel setup steps"""
+    with _print_lock:
+        print(*args)
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -30,44 +53,193 @@ def create_directories():
     ]
     
     for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
-        print(f"✅ Created directory: {directory}")
-
-def create_requirements_file():
-    """Create requirements.txt file"""
-    requirements = """
-selenium==4.15.0
-requests==2.31.0
-openai==0.28.1
-schedule==1.2.0
-beautifulsoup4==4.12.2
-pandas==2.1.0
-python-dotenv==1.0.0
-webdriver-manager==4.0.1
-lxml==4.9.3
-python-dateutil==2.8.2
-pytz==2023.3
-urllib3==2.0.4
-fake-useragent==1.4.0
-""".strip()
-    
-    with open('requirements.txt', 'w', encoding='utf-8') as f:
-        f.write(requirements)
-    print("✅ Created requirements.txt")
+        path = Path(directory)
+        if not path.is_dir():
+            path.mkdir()
+            print(f"✅ Created directory: {directory}")
 
-def install_requirements():
-    """Install required packages"""
+def load_state():
+    """Load hashes recorded by the previous setup run"""
     try:
-        print("📦 Installing required packages...")
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
-        print("✅ All packages installed successfully!")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error installing packages: {e}")
+        with open(STATE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state):
+    """Persist hashes for the next setup run"""
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def write_artifact(path, content, recorded_hash, kept_hash=None):
+    """
+    Write a generated file unless nothing would change.
+
+    Returns (status, hash of what setup wrote, hash of a kept local edit).
+    A file whose current content no longer matches the hash recorded for it
+    was edited by hand and is kept; it is only reported the first time.
+    """
+    new_hash = content_hash(content)
+    try:
+        with open(path, encoding='utf-8') as f:
+            current_hash = content_hash(f.read())
+    except OSError:
+        current_hash = None
+
+    if current_hash == new_hash:
+        return "unchanged", new_hash, None
+    if current_hash is not None and current_hash != recorded_hash:
+        status = "kept" if current_hash == kept_hash else "kept (edited locally)"
+        return status, recorded_hash, current_hash
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return ("updated" if current_hash else "created"), new_hash, None
+
+def generate_artifacts(state):
+    """
+    Write all generated files in parallel, skipping unchanged ones.
+
+    Returns the paths that were created or updated.
+    """
+    artifacts = {}
+    for builder in (build_env_template, build_config_file, build_resume_files):
+        artifacts.update(builder())
+
+    recorded = state.get('artifacts', {})
+    kept = state.get('kept', {})
+    with ThreadPoolExecutor() as executor:
+        futures = {
+            path: executor.submit(write_artifact, path, content, recorded.get(path), kept.get(path))
+            for path, content in artifacts.items()
+        }
+        results = {path: future.result() for path, future in futures.items()}
+
+    for path, (status, _, _) in results.items():
+        if status in ("unchanged", "kept"):
+            continue
+        icon = "⚠️ " if status.startswith("kept") else "✅"
+        log(f"{icon} {path}: {status}")
+    if all(status in ("unchanged", "kept") for status, _, _ in results.values()):
+        log("✅ All generated files up to date")
+
+    state['artifacts'] = {path: digest for path, (_, digest, _) in results.items() if digest}
+    state['kept'] = {path: digest for path, (_, _, digest) in results.items() if digest}
+    return [path for path, (status, _, _) in results.items() if status in ("created", "updated")]
+
+def read_requirements(path='requirements.txt'):
+    """Return requirement lines, without comments, blanks or pip options"""
+    requirements = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line and not line.startswith('-'):
+                requirements.append(line)
+    return requirements
+
+def _version_tuple(version):
+    """Release numbers of a plain X.Y.Z version, or None for pre/dev/post releases"""
+    release = version.split('+')[0]
+    if not re.match(r'^\d+(\.\d+)*$', release):
+        return None
+    return tuple(int(part) for part in release.split('.'))
+
+def requirement_satisfied(requirement):
+    """Check one requirement line against importlib.metadata (no pip call)"""
+    if Requirement is not None:
+        try:
+            parsed = Requirement(requirement)
+        except InvalidRequirement:
+            return False
+        if parsed.marker is not None and not parsed.marker.evaluate():
+            return True
+        try:
+            installed = metadata.version(parsed.name)
+        except metadata.PackageNotFoundError:
+            return False
+        return parsed.specifier.contains(installed, prereleases=True)
+
+    # Fallback without packaging: only simple comparisons of plain versions,
+    # anything else returns False so pip makes the decision
+    requirement = requirement.split(';', 1)[0].strip()
+    match = re.match(r'^([A-Za-z0-9_.\-]+)(\[[^\]]*\])?\s*(.*)$', requirement)
+    if not match:
+        return False
+    name, _, specifiers = match.groups()
+    try:
+        installed = _version_tuple(metadata.version(name))
+    except metadata.PackageNotFoundError:
+        return False
+    if installed is None:
         return False
 
-def create_env_file():
-    """Create .env template file"""
+    checks = {
+        '>=': lambda a, b: a >= b, '<=': lambda a, b: a <= b,
+        '==': lambda a, b: a == b, '!=': lambda a, b: a != b,
+        '>': lambda a, b: a > b, '<': lambda a, b: a < b,
+    }
+    for spec in filter(None, (s.strip() for s in specifiers.split(','))):
+        op_match = re.match(r'^(>=|<=|==|!=|>|<)\s*([\w.]+)$', spec)
+        if not op_match:
+            return False  # unsupported specifier (~=, wildcards...): let pip decide
+        op, wanted = op_match.groups()
+        wanted = _version_tuple(wanted)
+        if wanted is None:
+            return False
+        width = max(len(installed), len(wanted))
+        padded = installed + (0,) * (width - len(installed))
+        if not checks[op](padded, wanted + (0,) * (width - len(wanted))):
+            return False
+    return True
+
+def dependency_fingerprint(requirements):
+    """Hash of the requirement lines plus the versions currently installed"""
+    installed = []
+    for requirement in requirements:
+        name = re.split(r'[\[<>=!~;\s]', requirement, 1)[0]
+        try:
+            installed.append(f"{name}=={metadata.version(name)}")
+        except metadata.PackageNotFoundError:
+            installed.append(f"{name} missing")
+    return content_hash(sys.executable + "\n" + "\n".join(requirements + installed))
+
+def install_requirements(state):
+    """
+    Install only the requirements that are not already satisfied.
+
+    Returns "no requirements file", "skipped", "installed" or "failed".
+    """
+    if not os.path.exists('requirements.txt'):
+        log("⚠️  requirements.txt not found - skipping package installation")
+        return "no requirements file"
+
+    requirements = read_requirements()
+    if state.get('dependencies') == dependency_fingerprint(requirements):
+        log("✅ Packages unchanged since last setup - skipping pip")
+        return "skipped"
+
+    missing = [r for r in requirements if not requirement_satisfied(r)]
+    if not missing:
+        log("✅ All required packages already installed")
+        state['dependencies'] = dependency_fingerprint(requirements)
+        return "skipped"
+
+    try:
+        log(f"📦 Installing {len(missing)} package(s): {', '.join(missing)}")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *missing])
+        log("✅ All packages installed successfully!")
+    except subprocess.CalledProcessError as e:
+        log(f"❌ Error installing packages: {e}")
+        return "failed"
+    state['dependencies'] = dependency_fingerprint(requirements)
+    return "installed"
+
+def build_env_template():
+    """Build .env template file (only needed until .env exists)"""
     env_content = """# Job Automation Bot Configuration
 # Copy this file and rename to .env, then fill in your actual values
 
@@ -90,16 +262,12 @@ PROXY_URL=
 DEBUG_MODE=true
 """
     
-    if not os.path.exists('.env'):
-        with open('.env.template', 'w', encoding='utf-8') as f:
-            f.write(env_content)
-        print("✅ Created .env.template file")
-        print("📝 Please copy .env.template to .env and add your actual API keys")
-    else:
-        print("⚠️  .env file already exists")
-
-def create_config_file():
-    """Create personalized config.json for Priyanshi"""
+    if os.path.exists('.env'):
+        return {}
+    return {'.env.template': env_content}
+
+def build_config_file():
+    """Build personalized config.json for Priyanshi"""
     config = {
         "personal_info": {
             "name": "Priyanshi Dwivedi",
@@ -194,12 +362,10 @@ def create_config_file():
         }
     }
 
-    with open('config.json', 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=4)
-    print("✅ Created personalized config.json")
+    return {'config.json': json.dumps(config, indent=4)}
 
-def create_resume_files():
-    """Create resume template files"""
+def build_resume_files():
+    """Build resume template files"""
     
     # Full-Stack Resume
     fullstack_resume = """PRIYANSHI DWIVEDI
@@ -317,106 +483,15 @@ CERTIFICATIONS
 • Python Programming - Cisco Networking Academy
 • CCNA (Currently Pursuing)"""
 
-    # Save resume files
-    resume_files = {
+    return {
         'resumes/fullstack_resume.txt': fullstack_resume,
         'resumes/cybersecurity_resume.txt': cybersecurity_resume,
         'resumes/it_support_resume.txt': it_support_resume
     }
-    
-    for filename, content in resume_files.items():
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ Created {filename}")
-
-def create_startup_script():
-    """Create startup script for easy launching"""
-    
-    startup_content = """#!/usr/bin/env python3
-# Quick Start Script for Job Automation Bot
-
-import os
-import sys
-
-def main():
-    print("🤖 Job Automation Bot - InterviewCracker.AI")
-    print("=" * 50)
-    print("Created for Priyanshi Dwivedi")
-    print("=" * 50)
-    
-    # Check if main.py exists
-    if not os.path.exists('main.py'):
-        print("❌ main.py not found!")
-        print("Please ensure you have downloaded the main application file.")
-        return
-    
-    # Check if .env exists
-    if not os.path.exists('.env'):
-        print("⚠️  .env file not found!")
-        print("Please copy .env.template to .env and configure your API keys.")
-        response = input("Continue anyway? (y/n): ")
-        if response.lower() != 'y':
-            return
-    
-    # Run the main application
-    try:
-        os.system(f"{sys.executable} main.py")
-    except KeyboardInterrupt:
-        print("\\n👋 Application stopped by user")
-    except Exception as e:
-        print(f"❌ Error running application: {e}")
-
-if __name__ == "__main__":
-    main()
-"""
-
-    with open('start.py', 'w', encoding='utf-8') as f:
-        f.write(startup_content)
-    print("✅ Created start.py launcher script")
-
-def create_readme():
-
-    """Create a quick README file"""
-    readme_content = """# Job Automation Bot for Priyanshi Dwivedi
-
-## Quick Start
-1. Run `python setup.py` (you just did this!)
-2. Copy `.env.template` to `.env` and add your API keys
-3. Run `python start.py` to launch the application
-
-## Features
-- 🔍 Automated job searching across multiple platforms
-- 📝 AI-powered resume customization
-- 📧 Email notifications for applications
-- 🎯 Interview preparation with AI-generated questions
-- 📊 Aptitude tests for skill assessment
-- 📈 Application tracking and analytics
-
-## Your Profile
-- **Name**: Priyanshi Dwivedi
-- **Skills**: Full-Stack Development, Cybersecurity, IT Support
-- **Location**: Indore, MP
-- **Target**: Top tech companies and cybersecurity firms
-
-## Configuration
-- Check `config.json` for job preferences
-- Update resume templates in `resumes/` folder
-- Modify target companies and skills as needed
-
-## Support
-- Review the deployment guide for detailed setup
-- Check logs in `logs/` folder for troubleshooting
-- Update skills and preferences regularly for better matches
-
-Good luck with your job search! 🚀
-"""
-    
-    with open('README.md', 'w', encoding='utf-8') as f:
-        f.write(readme_content)
-    print("✅ Created README.md")
 
 def main():
     """Main setup function"""
+    started = time.monotonic()
     print("🚀 Setting up Job Automation Bot for Priyanshi Dwivedi")
     print("=" * 60)
     
@@ -425,36 +500,31 @@ def main():
         return
     
     # Create directories
-    print("\n📁 Creating project directories...")
+    print("\n📁 Checking project directories...")
     create_directories()
     
-    # Create configuration files
-    print("\n⚙️  Creating configuration files...")
-    create_requirements_file()
-    create_env_file()
-    create_config_file()
-    
-    # Create resume templates
-    print("\n📄 Creating resume templates...")
-    create_resume_files()
-    
-    # Create utility scripts
-    print("\n🛠️  Creating utility scripts...")
-    create_startup_script()
-    create_readme()
-    
-    # Install packages
-    print("\n📦 Installing required packages...")
-    install_success = install_requirements()
+    # Generated files and package installation are independent steps
+    print("\n⚙️  Generating configuration and resume templates...")
+    print("📦 Checking required packages...")
+    state = load_state()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        artifacts = executor.submit(generate_artifacts, state)
+        install = executor.submit(install_requirements, state)
+        written = artifacts.result()
+        install_status = install.result()
+    save_state(state)
     
     print("\n" + "=" * 60)
-    print("🎉 Setup Complete!")
+    print(f"🎉 Setup Complete! ({time.monotonic() - started:.2f}s)")
     print("=" * 60)
     
-    if install_success:
-        print("✅ All packages installed successfully")
-    else:
-        print("⚠️  Some packages failed to install - check manually")
+    install_messages = {
+        "installed": "✅ Missing packages installed successfully",
+        "skipped": "✅ Required packages already installed - pip skipped",
+        "failed": "⚠️  Some packages failed to install - check manually",
+        "no requirements file": "⚠️  requirements.txt not found - no packages installed",
+    }
+    print(install_messages[install_status])
     
     print("\n📋 Next Steps:")
     print("1. Copy .env.template to .env")
@@ -462,12 +532,15 @@ def main():
     print("3. Download the main.py file and place it in this directory")
     print("4. Run: python start.py")
     
-    print("\n📚 Important Files Created:")
-    print("• config.json - Your personalized job search configuration")
-    print("• resumes/ - Your resume templates for each career path")
-    print("• .env.template - Environment variables template")
-    print("• requirements.txt - Python dependencies")
-    print("• start.py - Quick launcher script")
+    if written:
+        descriptions = {
+            'config.json': "Your personalized job search configuration",
+            '.env.template': "Environment variables template",
+        }
+        print("\n📚 Files Created/Updated:")
+        for path in written:
+            description = descriptions.get(path, "Resume template")
+            print(f"• {path} - {description}")
     
     print("\n🎯 Your Job Search Profile:")
     print("• Target Roles: Full-Stack Developer, Cybersecurity Analyst, IT Support")